@@ -3,20 +3,73 @@
 """
 import os
 import json
-from typing import Dict, List
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import HTMLResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
 from app.models import RouteRequest, RouteResponse, Point, CoordinateRouteRequest
-from app.pathfinder import Graph, astar_algorithm, add_temporary_nodes
+from app.pathfinder import Graph, astar_algorithm, find_nearest_node
+from app.workers import init_worker, find_path
+
+# Пул процессов для расчета маршрутов (создается при запуске приложения,
+# если задана переменная окружения ROUTE_WORKERS)
+route_pool: Optional[ProcessPoolExecutor] = None
+
+
+def create_route_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Создание пула процессов для расчета маршрутов.
+    
+    Пул включается только явно: для небольшого графа передача задачи
+    в другой процесс обходится дороже самого поиска, поэтому по умолчанию
+    маршрут считается в пуле потоков основного процесса.
+    
+    Returns:
+        Optional[ProcessPoolExecutor]: Пул процессов или None, если ROUTE_WORKERS не задано
+    """
+    if ROUTE_WORKERS <= 0:
+        return None
+    return ProcessPoolExecutor(
+        max_workers=ROUTE_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker,
+        initargs=(GRAPH_FILE,)
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Жизненный цикл приложения: запуск и остановка пула процессов.
+    
+    Каждый процесс пула загружает граф один раз.
+    
+    Args:
+        app: Экземпляр приложения
+    """
+    global route_pool
+    route_pool = create_route_pool()
+    yield
+    if route_pool is not None:
+        route_pool.shutdown()
+        route_pool = None
+
 
 # Создание экземпляра FastAPI
 app = FastAPI(
     title="Mall Pathfinder",
     description="API для поиска кратчайшего пути между двумя точками на карте торгового центра",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Определение путей к директориям
@@ -26,6 +79,9 @@ TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
 DATA_DIR = os.path.join(BASE_DIR, "data")
 GRAPH_FILE = os.path.join(DATA_DIR, "graph.json")
 
+# Число процессов для расчета маршрутов (0 - расчет в пуле потоков)
+ROUTE_WORKERS = int(os.environ.get("ROUTE_WORKERS", "0"))
+
 # Монтирование статических файлов
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
@@ -42,6 +98,76 @@ except Exception as e:
     graph = Graph()
 
 
+@lru_cache(maxsize=4096)
+def _cached_astar(start_id: str, end_id: str) -> Tuple[str, ...]:
+    """
+    Расчет маршрута между узлами графа основного процесса с кэшированием результата.
+    
+    Граф после загрузки не изменяется, поэтому повторные запросы
+    для той же пары узлов не запускают A*. При замене графа кэш
+    необходимо сбросить через _cached_astar.cache_clear().
+    
+    Args:
+        start_id: ID начального узла
+        end_id: ID конечного узла
+        
+    Returns:
+        Tuple[str, ...]: ID узлов, составляющих кратчайший путь
+    """
+    return tuple(astar_algorithm(graph, start_id, end_id))
+
+
+async def find_route(start_id: str, end_id: str) -> Tuple[str, ...]:
+    """
+    Расчет маршрута между узлами графа без блокировки цикла событий.
+    
+    Если пул процессов запущен, расчет выполняется в нем. Иначе (пул
+    не включен или обработчик жизненного цикла не вызывался) маршрут
+    считается в пуле потоков по графу основного процесса.
+    
+    Args:
+        start_id: ID начального узла
+        end_id: ID конечного узла
+        
+    Returns:
+        Tuple[str, ...]: ID узлов, составляющих кратчайший путь
+    """
+    global route_pool
+    pool = route_pool
+    if pool is None:
+        return await run_in_threadpool(_cached_astar, start_id, end_id)
+    
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(pool, find_path, start_id, end_id)
+    except BrokenProcessPool:
+        # Рабочий процесс аварийно завершился: заменяем пул новым
+        # (если его еще не заменил другой запрос), а текущий запрос
+        # обрабатываем в основном процессе
+        if route_pool is pool:
+            route_pool = create_route_pool()
+            pool.shutdown(wait=False)
+        return await run_in_threadpool(_cached_astar, start_id, end_id)
+
+
+def route_response(route: List[Point]) -> Response:
+    """
+    Формирование ответа с маршрутом.
+    
+    Точки маршрута берутся из уже проверенного графа или запроса, поэтому
+    модель ответа собирается без повторной валидации и сразу сериализуется
+    в JSON (pydantic v2). Готовый Response FastAPI не проверяет повторно.
+    
+    Args:
+        route: Список точек маршрута
+        
+    Returns:
+        Response: JSON-ответ в формате RouteResponse
+    """
+    content = RouteResponse.model_construct(route=route).model_dump_json()
+    return Response(content=content, media_type="application/json")
+
+
 @app.get("/", response_class=HTMLResponse)
 async def get_index(request: Request):
     """
@@ -101,13 +227,13 @@ async def calculate_route(request: RouteRequest):
         raise HTTPException(status_code=404, detail=f"Конечный узел {request.end} не найден")
     
     try:
-        # Расчет маршрута
-        path = astar_algorithm(graph, request.start, request.end)
+        # Расчет маршрута в пуле процессов
+        path = await find_route(request.start, request.end)
         
         # Преобразование пути в список координат
-        route = [Point(x=graph.nodes[node_id]["x"], y=graph.nodes[node_id]["y"]) for node_id in path]
+        route = [Point.model_construct(x=graph.nodes[node_id]["x"], y=graph.nodes[node_id]["y"]) for node_id in path]
         
-        return RouteResponse(route=route)
+        return route_response(route)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -129,20 +255,21 @@ async def calculate_route_by_coordinates(request: CoordinateRouteRequest):
         HTTPException: Если путь не существует
     """
     try:
-        # Создаем граф с временными узлами
-        temp_graph, start_temp_id, end_temp_id = add_temporary_nodes(
-            graph, 
-            (request.start.x, request.start.y), 
-            (request.end.x, request.end.y)
-        )
+        # Привязываем точки к ближайшим узлам графа. Маршрут через временные
+        # узлы всегда проходит через эти узлы, поэтому достаточно найти путь
+        # между ними (с использованием кэша) и добавить исходные точки по краям
+        start_nearest = find_nearest_node(graph, request.start.x, request.start.y)
+        end_nearest = find_nearest_node(graph, request.end.x, request.end.y)
         
-        # Расчет маршрута
-        path = astar_algorithm(temp_graph, start_temp_id, end_temp_id)
+        # Расчет маршрута в пуле процессов
+        path = await find_route(start_nearest, end_nearest)
         
         # Преобразование пути в список координат
-        route = [Point(x=temp_graph.nodes[node_id]["x"], y=temp_graph.nodes[node_id]["y"]) for node_id in path]
+        route = [request.start]
+        route.extend(Point.model_construct(x=graph.nodes[node_id]["x"], y=graph.nodes[node_id]["y"]) for node_id in path)
+        route.append(request.end)
         
-        return RouteResponse(route=route)
+        return route_response(route)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
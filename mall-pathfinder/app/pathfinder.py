@@ -1,9 +1,22 @@
 """
 Модуль для работы с графом и алгоритмом A* для поиска кратчайшего пути.
 """
-import json
 import heapq
-from typing import Dict, List, Tuple, Set, Optional, Any
+import threading
+from array import array
+from collections import ChainMap, OrderedDict
+from math import hypot
+from typing import Dict, List, Tuple, Optional, Any
+
+# orjson разбирает JSON в несколько раз быстрее стандартного модуля,
+# но не является обязательной зависимостью
+try:
+    import orjson as json
+except ImportError:
+    import json
+
+# Максимальное число целей, для которых граф хранит массивы эвристики
+H_CACHE_SIZE = 64
 
 
 class Graph:
@@ -15,6 +28,9 @@ class Graph:
                                           значение - словарь с координатами x, y.
         edges (Dict[str, List[str]]): Словарь связей, где ключ - ID узла,
                                      значение - список ID соседних узлов.
+    
+    При создании граф дополнительно упаковывается в массивы (CSR) для A*,
+    поэтому nodes и edges не следует изменять после инициализации.
     """
     
     def __init__(self, nodes: Dict[str, Dict[str, int]] = None, edges: Dict[str, List[str]] = None):
@@ -27,6 +43,147 @@ class Graph:
         """
         self.nodes = nodes or {}
         self.edges = edges or {}
+        self._edge_sets: Dict[str, frozenset] = {}
+        self._build_index()
+    
+    def _build_index(self) -> None:
+        """
+        Построение компактного представления графа для алгоритма A*.
+        
+        Каждому узлу назначается целочисленный индекс, координаты хранятся
+        в массивах _xs/_ys, а связи - в CSR-структуре: соседи узла i лежат
+        в _nbr[_row_start[i]:_row_end[i]], длины соответствующих рёбер - в _w.
+        Начало и конец строки хранятся отдельно, чтобы граф-надстройка могла
+        перенаправить строку любого узла, не перестраивая остальные.
+        Длины рёбер также сохраняются по парам ID в обоих направлениях (_edge_w).
+        Рёбра к отсутствующим в nodes узлам отбрасываются.
+        """
+        self._ids: List[str] = list(self.nodes)
+        self._idx: Dict[str, int] = {node_id: i for i, node_id in enumerate(self._ids)}
+        self._xs = array('d', (self.nodes[node_id]["x"] for node_id in self._ids))
+        self._ys = array('d', (self.nodes[node_id]["y"] for node_id in self._ids))
+        indptr = array('i', [0])
+        self._nbr = array('i')
+        self._w = array('d')
+        self._edge_w: Dict[Tuple[str, str], float] = {}
+        
+        for i, node_id in enumerate(self._ids):
+            x, y = self._xs[i], self._ys[i]
+            for neighbor in self.edges.get(node_id, []):
+                j = self._idx.get(neighbor)
+                if j is None:
+                    continue
+                weight = hypot(self._xs[j] - x, self._ys[j] - y)
+                self._nbr.append(j)
+                self._w.append(weight)
+                self._edge_w[(node_id, neighbor)] = weight
+                self._edge_w[(neighbor, node_id)] = weight
+            indptr.append(len(self._nbr))
+        
+        self._row_start = indptr[:-1]
+        self._row_end = indptr[1:]
+        
+        # k-d дерево для поиска ближайшего узла строится при первом запросе
+        self._kd_order: Optional[array] = None
+        
+        # Значения эвристики для последних целей, накапливаемые между запросами
+        self._h_caches: 'OrderedDict[int, array]' = OrderedDict()
+        self._h_lock = threading.Lock()
+    
+    def _h_array(self, end: int) -> array:
+        """
+        Массив значений эвристики до заданной цели.
+        
+        Массив создается при первом запросе к цели, заполнен NaN
+        и дозаполняется алгоритмом A* по мере вычисления эвристики.
+        Повторные поиски пути к той же цели используют уже вычисленные значения.
+        Хранятся массивы не более чем для H_CACHE_SIZE последних целей,
+        давно не запрашивавшиеся вытесняются.
+        
+        Args:
+            end: Индекс конечного узла
+            
+        Returns:
+            array: Массив эвристики длины, равной числу узлов
+        """
+        with self._h_lock:
+            h_arr = self._h_caches.get(end)
+            if h_arr is None:
+                h_arr = array('d', [float('nan')]) * len(self._ids)
+                self._h_caches[end] = h_arr
+                if len(self._h_caches) > H_CACHE_SIZE:
+                    self._h_caches.popitem(last=False)
+            else:
+                self._h_caches.move_to_end(end)
+        return h_arr
+    
+    def _build_kdtree(self) -> None:
+        """
+        Построение статического 2D k-d дерева по координатам узлов.
+        
+        Дерево хранится неявно в массиве _kd_order: для отрезка [lo, hi)
+        корнем является элемент с индексом (lo + hi) // 2, слева от него
+        лежат узлы с меньшей координатой по текущей оси, справа - с большей.
+        Оси чередуются с глубиной (x, y, x, ...).
+        """
+        order = list(range(len(self._ids)))
+        stack = [(0, len(order), 0)]
+        while stack:
+            lo, hi, axis = stack.pop()
+            if hi - lo <= 1:
+                continue
+            coords = self._xs if axis == 0 else self._ys
+            order[lo:hi] = sorted(order[lo:hi], key=coords.__getitem__)
+            mid = (lo + hi) // 2
+            stack.append((lo, mid, 1 - axis))
+            stack.append((mid + 1, hi, 1 - axis))
+        self._kd_order = array('i', order)
+    
+    def _nearest_index(self, x: float, y: float) -> int:
+        """
+        Поиск индекса ближайшего к точке узла по k-d дереву.
+        При равных расстояниях выбирается узел с меньшим индексом.
+        
+        Args:
+            x: Координата X точки
+            y: Координата Y точки
+            
+        Returns:
+            int: Индекс ближайшего узла
+        """
+        if self._kd_order is None:
+            self._build_kdtree()
+        order, xs, ys = self._kd_order, self._xs, self._ys
+        
+        best_index = -1
+        best_distance = float('inf')
+        # Элементы стека: границы отрезка, ось и квадрат расстояния
+        # до разделяющей прямой (нижняя оценка для всего поддерева)
+        stack = [(0, len(order), 0, 0.0)]
+        while stack:
+            lo, hi, axis, bound = stack.pop()
+            if lo >= hi or bound > best_distance:
+                continue
+            
+            mid = (lo + hi) // 2
+            i = order[mid]
+            dx = xs[i] - x
+            dy = ys[i] - y
+            distance = dx * dx + dy * dy
+            if distance < best_distance or (distance == best_distance and i < best_index):
+                best_distance = distance
+                best_index = i
+            
+            # Сначала обходим половину, в которой лежит точка
+            diff = dx if axis == 0 else dy
+            if diff > 0:
+                stack.append((mid + 1, hi, 1 - axis, diff * diff))
+                stack.append((lo, mid, 1 - axis, 0.0))
+            else:
+                stack.append((lo, mid, 1 - axis, diff * diff))
+                stack.append((mid + 1, hi, 1 - axis, 0.0))
+        
+        return best_index
     
     @classmethod
     def from_json(cls, json_data: Dict[str, Any]) -> 'Graph':
@@ -52,8 +209,8 @@ class Graph:
         Returns:
             Graph: Экземпляр графа
         """
-        with open(file_path, 'r') as f:
-            json_data = json.load(f)
+        with open(file_path, 'rb') as f:
+            json_data = json.loads(f.read())
         return cls.from_json(json_data)
     
     def get_neighbors(self, node_id: str) -> List[str]:
@@ -79,8 +236,25 @@ class Graph:
         Returns:
             bool: True, если ребро существует
         """
-        return (node_id2 in self.edges.get(node_id1, []) or 
-                node_id1 in self.edges.get(node_id2, []))
+        return (node_id2 in self._edge_set(node_id1) or 
+                node_id1 in self._edge_set(node_id2))
+    
+    def _edge_set(self, node_id: str) -> frozenset:
+        """
+        Множество соседей узла для проверки наличия ребра за O(1).
+        Строится лениво при первом обращении и кэшируется.
+        
+        Args:
+            node_id: ID узла
+            
+        Returns:
+            frozenset: Множество ID соседних узлов
+        """
+        neighbors = self._edge_sets.get(node_id)
+        if neighbors is None:
+            neighbors = frozenset(self.edges.get(node_id, ()))
+            self._edge_sets[node_id] = neighbors
+        return neighbors
     
     def heuristic(self, node_id1: str, node_id2: str) -> float:
         """
@@ -98,7 +272,7 @@ class Graph:
         
         node1 = self.nodes[node_id1]
         node2 = self.nodes[node_id2]
-        return ((node1["x"] - node2["x"]) ** 2 + (node1["y"] - node2["y"]) ** 2) ** 0.5
+        return hypot(node1["x"] - node2["x"], node1["y"] - node2["y"])
     
     def distance(self, node_id1: str, node_id2: str) -> float:
         """
@@ -112,103 +286,255 @@ class Graph:
         Returns:
             float: Расстояние между узлами или бесконечность
         """
-        # Проверяем, есть ли ребро между узлами
-        if not self.has_edge(node_id1, node_id2):
-            return float('inf')
+        # Длины всех рёбер вычислены заранее при построении графа
+        return self._edge_w.get((node_id1, node_id2), float('inf'))
+
+
+class OverlayGraph(Graph):
+    """
+    Граф-надстройка: базовый граф с небольшим числом добавленных узлов и связей.
+    
+    Словари узлов и связей базового графа не копируются - то, чего нет
+    в надстройке, берется из них напрямую (через ChainMap). Для A* заново
+    вычисляются только строки CSR для узлов, чьи связи заданы в надстройке.
+    
+    Массивы CSR и координат базового графа при этом копируются целиком
+    (копирование выполняется на уровне C, без цикла на Python), поэтому
+    стоимость создания надстройки остается O(N + E).
+    
+    Атрибуты:
+        base (Graph): Базовый граф
+    """
+    
+    def __init__(self, base: Graph, extra_nodes: Dict[str, Dict[str, int]], extra_edges: Dict[str, List[str]]):
+        """
+        Инициализация графа-надстройки.
         
-        return self.heuristic(node_id1, node_id2)
+        Args:
+            base: Базовый граф
+            extra_nodes: Добавляемые узлы {node_id: {"x": x, "y": y}}
+            extra_edges: Полные списки соседей для новых и изменяемых узлов
+                         {node_id: [connected_node_ids]}
+        """
+        self.base = base
+        self._extra_nodes = extra_nodes
+        self._extra_edges = extra_edges
+        self.nodes = ChainMap(extra_nodes, base.nodes)
+        self.edges = ChainMap(extra_edges, base.edges)
+        self._edge_sets: Dict[str, frozenset] = {}
+        self._build_index()
+    
+    def _build_index(self) -> None:
+        """
+        Построение CSR-представления поверх массивов базового графа.
+        
+        Новые узлы получают индексы после узлов базового графа, а строки
+        соседей для узлов из extra_edges дописываются в конец копий массивов
+        _nbr/_w, а их границы записываются в копии _row_start/_row_end.
+        Длины новых рёбер добавляются поверх _edge_w базового графа.
+        """
+        base = self.base
+        n = len(base._ids)
+        new_ids = [node_id for node_id in self._extra_nodes if node_id not in base._idx]
+        
+        self._ids = base._ids + new_ids
+        self._idx = ChainMap({node_id: n + i for i, node_id in enumerate(new_ids)}, base._idx)
+        self._xs = base._xs + array('d', (self._extra_nodes[node_id]["x"] for node_id in new_ids))
+        self._ys = base._ys + array('d', (self._extra_nodes[node_id]["y"] for node_id in new_ids))
+        self._row_start = base._row_start + array('i', [0]) * len(new_ids)
+        self._row_end = base._row_end + array('i', [0]) * len(new_ids)
+        self._nbr = base._nbr + array('i')
+        self._w = base._w + array('d')
+        new_edge_w: Dict[Tuple[str, str], float] = {}
+        self._edge_w = ChainMap(new_edge_w, base._edge_w)
+        
+        # У каждого нового узла должна быть своя строка, даже пустая
+        for node_id in dict.fromkeys(new_ids + list(self._extra_edges)):
+            i = self._idx.get(node_id)
+            if i is None:
+                continue
+            x, y = self._xs[i], self._ys[i]
+            row_start = len(self._nbr)
+            for neighbor in self.edges.get(node_id, []):
+                j = self._idx.get(neighbor)
+                if j is None:
+                    continue
+                weight = hypot(self._xs[j] - x, self._ys[j] - y)
+                self._nbr.append(j)
+                self._w.append(weight)
+                new_edge_w[(node_id, neighbor)] = weight
+                new_edge_w[(neighbor, node_id)] = weight
+            self._row_start[i] = row_start
+            self._row_end[i] = len(self._nbr)
+        
+        self._kd_order = None
+        self._h_caches = OrderedDict()
+        self._h_lock = threading.Lock()
 
 
-def astar_algorithm(graph: Graph, start_id: str, end_id: str) -> List[str]:
+def _astar_csr(row_start: array, row_end: array, nbr: array, weights: array,
+               xs: array, ys: array, h_arr: array, start: int, end: int) -> List[int]:
     """
-    Реализация алгоритма A* для поиска кратчайшего пути в графе.
+    Ядро алгоритма A* над CSR-представлением графа.
+    
+    Работает только с числовыми массивами и целочисленными индексами узлов,
+    без обращения к объекту Graph и строковым ID.
     
     Args:
-        graph: Граф
-        start_id: ID начального узла
-        end_id: ID конечного узла
+        row_start: Начала строк CSR
+        row_end: Концы строк CSR
+        nbr: Индексы соседних узлов
+        weights: Длины соответствующих рёбер
+        xs: Координаты X узлов
+        ys: Координаты Y узлов
+        h_arr: Значения эвристики до конечного узла (NaN - еще не вычислено),
+               дозаполняется в ходе поиска
+        start: Индекс начального узла
+        end: Индекс конечного узла
         
     Returns:
-        List[str]: Список ID узлов, составляющих кратчайший путь
+        List[int]: Индексы узлов кратчайшего пути или пустой список, если пути нет
     """
-    # Проверка наличия узлов в графе
-    if start_id not in graph.nodes or end_id not in graph.nodes:
-        raise ValueError(f"Узлы {start_id} или {end_id} не найдены в графе")
+    # Эвристика считается относительно одной и той же цели, поэтому
+    # значение для каждого узла вычисляется один раз и сохраняется в h_arr
+    end_x, end_y = xs[end], ys[end]
     
-    # Если начальный и конечный узлы совпадают
-    if start_id == end_id:
-        return [start_id]
+    # Состояние поиска хранится в плотных массивах, индексируемых номером узла
+    n = len(xs)
+    inf = float('inf')
     
-    # Множество посещенных узлов
-    closed_set: Set[str] = set()
+    # Флаги посещенных узлов
+    closed_set = bytearray(n)
     
-    # Множество узлов в открытом списке для быстрой проверки
-    open_set_nodes: Set[str] = {start_id}
+    # Предыдущий узел на оптимальном пути (-1 - нет предыдущего)
+    came_from = array('i', [-1]) * n
     
-    # Словарь для хранения предыдущего узла на оптимальном пути
-    came_from: Dict[str, Optional[str]] = {}
+    # Стоимость пути от начального узла до текущего
+    g_score = array('d', [inf]) * n
+    g_score[start] = 0.0
     
-    # Словарь для хранения стоимости пути от начального узла до текущего
-    g_score: Dict[str, float] = {start_id: 0}
+    # Оценка полной стоимости пути через узел f = g + h отдельно не хранится:
+    # h вычисляется не более одного раза на узел и берется из h_arr,
+    # а f нужна только в записях очереди
+    h = h_arr[start]
+    if h != h:
+        h = hypot(xs[start] - end_x, ys[start] - end_y)
+        h_arr[start] = h
     
-    # Словарь для хранения оценки полной стоимости пути через текущий узел
-    f_score: Dict[str, float] = {start_id: graph.heuristic(start_id, end_id)}
+    # Очередь с приоритетом для выбора узла с наименьшей оценкой f.
+    # Узел добавляется заново при каждом улучшении оценки, а устаревшие
+    # записи отбрасываются при извлечении (ленивое удаление).
+    # Используется двоичная куча heapq: она реализована на C, и d-арная
+    # куча на чистом Python оказывается в несколько раз медленнее нее
+    open_set = [(h, start)]
     
-    # Очередь с приоритетом для выбора узла с наименьшей оценкой f_score
-    open_set = [(f_score[start_id], start_id)]
-    heapq.heapify(open_set)
+    # Лучшая из новых записей последнего раскрытия узла, еще не помещенная
+    # в очередь. На следующей итерации она добавляется и извлекается одной
+    # операцией heappushpop, которая не трогает кучу, если эта запись
+    # и так минимальна (частый случай в A*)
+    pending = None
     
-    while open_set:
-        # Извлечение узла с наименьшей оценкой f_score
-        current_f, current = heapq.heappop(open_set)
+    while open_set or pending is not None:
+        # Извлечение узла с наименьшей оценкой f
+        if pending is None:
+            current_f, current = heapq.heappop(open_set)
+        else:
+            current_f, current = heapq.heappushpop(open_set, pending)
+            pending = None
         
         # Проверяем, что узел еще актуален (может быть устаревшая запись)
-        if current in closed_set:
+        if closed_set[current]:
             continue
-            
-        # Удаляем из открытого множества
-        open_set_nodes.discard(current)
-        
-        # Если достигнут конечный узел, восстанавливаем путь
-        if current == end_id:
-            path = []
-            while current:
-                path.append(current)
-                current = came_from.get(current)
-            return path[::-1]  # Возвращаем путь в обратном порядке
         
         # Добавляем текущий узел в множество посещенных
-        closed_set.add(current)
+        closed_set[current] = 1
+        current_g = g_score[current]
         
-        # Перебираем соседние узлы (только те, которые связаны ребрами!)
-        for neighbor in graph.get_neighbors(current):
+        # Перебираем соседние узлы: наличие в CSR уже означает наличие ребра,
+        # а его длина вычислена заранее при построении графа
+        for k in range(row_start[current], row_end[current]):
+            neighbor = nbr[k]
+            
+            # Если достигнут конечный узел, сразу восстанавливаем путь, не
+            # добавляя узел в очередь. Длина ребра равна расстоянию по прямой,
+            # т.е. эвристике текущего узла, поэтому длина пути равна его f,
+            # а она не больше оценки любого узла в очереди - путь оптимален
+            if neighbor == end:
+                came_from[end] = current
+                path = []
+                while neighbor != -1:
+                    path.append(neighbor)
+                    neighbor = came_from[neighbor]
+                path.reverse()  # Разворачиваем путь на месте, без копирования
+                return path
+            
             # Пропускаем уже посещенные узлы
-            if neighbor in closed_set:
+            if closed_set[neighbor]:
                 continue
             
             # Вычисляем стоимость пути до соседнего узла через текущий
-            edge_distance = graph.distance(current, neighbor)
-            
-            # Если ребра нет, пропускаем
-            if edge_distance == float('inf'):
-                continue
-                
-            tentative_g_score = g_score[current] + edge_distance
+            tentative_g_score = current_g + weights[k]
             
             # Если найден более короткий путь к соседу
-            if tentative_g_score < g_score.get(neighbor, float('inf')):
+            if tentative_g_score < g_score[neighbor]:
                 # Обновляем информацию о пути
                 came_from[neighbor] = current
                 g_score[neighbor] = tentative_g_score
-                f_score[neighbor] = g_score[neighbor] + graph.heuristic(neighbor, end_id)
                 
-                # Добавляем соседний узел в очередь, если его там нет
-                if neighbor not in open_set_nodes:
-                    heapq.heappush(open_set, (f_score[neighbor], neighbor))
-                    open_set_nodes.add(neighbor)
+                h = h_arr[neighbor]
+                if h != h:
+                    h = hypot(xs[neighbor] - end_x, ys[neighbor] - end_y)
+                    h_arr[neighbor] = h
+                
+                # Добавляем соседний узел в очередь с новой оценкой,
+                # придерживая запись с наименьшей оценкой до следующей итерации
+                entry = (tentative_g_score + h, neighbor)
+                if pending is None:
+                    pending = entry
+                elif entry < pending:
+                    heapq.heappush(open_set, pending)
+                    pending = entry
+                else:
+                    heapq.heappush(open_set, entry)
+    
+    # Путь не найден
+    return []
+
+
+def astar_algorithm(graph: Graph, start_id: str, end_id: str) -> List[str]:
+    """
+    Реализация алгоритма A* для поиска кратчайшего пути в графе.
+    
+    Args:
+        graph: Граф
+        start_id: ID начального узла
+        end_id: ID конечного узла
+        
+    Returns:
+        List[str]: Список ID узлов, составляющих кратчайший путь
+    """
+    # Проверка наличия узлов в графе
+    if start_id not in graph.nodes or end_id not in graph.nodes:
+        raise ValueError(f"Узлы {start_id} или {end_id} не найдены в графе")
+    
+    # Если начальный и конечный узлы совпадают
+    if start_id == end_id:
+        return [start_id]
+    
+    # Поиск выполняется над компактным представлением графа по индексам узлов
+    start = graph._idx[start_id]
+    end = graph._idx[end_id]
+    path = _astar_csr(
+        graph._row_start, graph._row_end, graph._nbr, graph._w,
+        graph._xs, graph._ys, graph._h_array(end), start, end
+    )
     
     # Если путь не найден
-    raise ValueError(f"Путь между узлами {start_id} и {end_id} не найден")
+    if not path:
+        raise ValueError(f"Путь между узлами {start_id} и {end_id} не найден")
+    
+    ids = graph._ids
+    return [ids[node] for node in path]
 
 
 def find_nearest_node(graph: Graph, x: int, y: int) -> str:
@@ -226,16 +552,9 @@ def find_nearest_node(graph: Graph, x: int, y: int) -> str:
     if not graph.nodes:
         raise ValueError("Граф не содержит узлов")
     
-    min_distance = float('inf')
-    nearest_node = None
+    nearest_index = graph._nearest_index(x, y)
     
-    for node_id, node_data in graph.nodes.items():
-        distance = ((node_data["x"] - x) ** 2 + (node_data["y"] - y) ** 2) ** 0.5
-        if distance < min_distance:
-            min_distance = distance
-            nearest_node = node_id
-    
-    return nearest_node
+    return graph._ids[nearest_index]
 
 
 def add_temporary_nodes(graph: Graph, start_point: Tuple[int, int], end_point: Tuple[int, int]) -> Tuple[Graph, str, str]:
@@ -248,40 +567,33 @@ def add_temporary_nodes(graph: Graph, start_point: Tuple[int, int], end_point: T
         end_point: Координаты конечной точки (x, y)
         
     Returns:
-        Tuple[Graph, str, str]: Новый граф с временными узлами, ID начального и конечного узлов
+        Tuple[Graph, str, str]: Граф-надстройка с временными узлами, ID начального и конечного узлов
     """
-    # Создаем копию графа
-    new_nodes = graph.nodes.copy()
-    new_edges = {}
-    for node_id, neighbors in graph.edges.items():
-        new_edges[node_id] = neighbors.copy()
-    
     # ID для временных узлов
     start_temp_id = "TEMP_START"
     end_temp_id = "TEMP_END"
     
-    # Добавляем временные узлы
-    new_nodes[start_temp_id] = {"x": start_point[0], "y": start_point[1]}
-    new_nodes[end_temp_id] = {"x": end_point[0], "y": end_point[1]}
-    
-    # Создаем новый граф с временными узлами
-    temp_graph = Graph(new_nodes, new_edges)
+    # Временные узлы
+    new_nodes = {
+        start_temp_id: {"x": start_point[0], "y": start_point[1]},
+        end_temp_id: {"x": end_point[0], "y": end_point[1]}
+    }
     
     # Находим ближайшие узлы
     start_nearest = find_nearest_node(graph, start_point[0], start_point[1])
     end_nearest = find_nearest_node(graph, end_point[0], end_point[1])
     
     # Подключаем временные узлы к ближайшим
-    temp_graph.edges[start_temp_id] = [start_nearest]
-    temp_graph.edges[end_temp_id] = [end_nearest]
+    new_edges = {
+        start_temp_id: [start_nearest],
+        end_temp_id: [end_nearest]
+    }
     
-    # Добавляем обратные связи
-    if start_nearest not in temp_graph.edges:
-        temp_graph.edges[start_nearest] = []
-    temp_graph.edges[start_nearest].append(start_temp_id)
+    # Добавляем обратные связи (списки соседей базового графа не изменяются)
+    new_edges[start_nearest] = graph.get_neighbors(start_nearest) + [start_temp_id]
+    new_edges[end_nearest] = new_edges.get(end_nearest, graph.get_neighbors(end_nearest)) + [end_temp_id]
     
-    if end_nearest not in temp_graph.edges:
-        temp_graph.edges[end_nearest] = []
-    temp_graph.edges[end_nearest].append(end_temp_id)
+    # Создаем граф-надстройку над исходным графом без его копирования
+    temp_graph = OverlayGraph(graph, new_nodes, new_edges)
     
     return temp_graph, start_temp_id, end_temp_id
\ No newline at end of file
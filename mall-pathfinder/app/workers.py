@@ -0,0 +1,44 @@
+"""
+Модуль для расчета маршрутов в рабочих процессах.
+
+Каждый процесс пула один раз загружает граф при запуске и затем
+выполняет поиск пути по ID узлов, кэшируя результаты.
+"""
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from app.pathfinder import Graph, astar_algorithm
+
+# Граф, загруженный в текущем рабочем процессе
+_graph: Optional[Graph] = None
+
+
+def init_worker(graph_file: str) -> None:
+    """
+    Инициализация рабочего процесса: загрузка графа из JSON-файла.
+    
+    Args:
+        graph_file: Путь к JSON-файлу с графом
+    """
+    global _graph
+    _graph = Graph.from_json_file(graph_file)
+    find_path.cache_clear()
+
+
+@lru_cache(maxsize=4096)
+def find_path(start_id: str, end_id: str) -> Tuple[str, ...]:
+    """
+    Расчет маршрута между узлами графа с кэшированием результата.
+    
+    Граф после загрузки не изменяется, поэтому повторные запросы
+    для той же пары узлов не запускают A*. Кэш у каждого процесса свой
+    и сбрасывается при повторной инициализации.
+    
+    Args:
+        start_id: ID начального узла
+        end_id: ID конечного узла
+        
+    Returns:
+        Tuple[str, ...]: ID узлов, составляющих кратчайший путь
+    """
+    return tuple(astar_algorithm(_graph, start_id, end_id))
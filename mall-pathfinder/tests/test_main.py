@@ -0,0 +1,72 @@
+"""
+Тесты для API из модуля main.py
+"""
+import sys
+import os
+from fastapi.testclient import TestClient
+
+# Добавляем путь к директории app в sys.path для импорта приложения
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app import main
+from app.main import app, graph
+
+
+def test_route_without_lifespan():
+    """Тест расчета маршрута, когда обработчик жизненного цикла не запускался"""
+    # Без контекстного менеджера TestClient не вызывает lifespan,
+    # поэтому пул процессов не создается
+    client = TestClient(app)
+    start, end = "entrance", "build_2"
+    
+    response = client.post("/api/route", json={"start": start, "end": end})
+    assert response.status_code == 200
+    route = response.json()["route"]
+    assert route[0] == {"x": graph.nodes[start]["x"], "y": graph.nodes[start]["y"]}
+    assert route[-1] == {"x": graph.nodes[end]["x"], "y": graph.nodes[end]["y"]}
+
+
+def test_route_by_coordinates_without_lifespan():
+    """Тест расчета маршрута по координатам без запуска lifespan"""
+    client = TestClient(app)
+    start, end = {"x": 160, "y": 1400}, {"x": 600, "y": 1800}
+    
+    response = client.post("/api/route/coordinates", json={"start": start, "end": end})
+    assert response.status_code == 200
+    route = response.json()["route"]
+    assert route[0] == start
+    assert route[-1] == end
+    assert len(route) > 2
+
+
+def test_route_unknown_node():
+    """Тест расчета маршрута с несуществующим узлом"""
+    client = TestClient(app)
+    response = client.post("/api/route", json={"start": "entrance", "end": "Z"})
+    assert response.status_code == 404
+
+
+def test_route_with_process_pool(monkeypatch):
+    """Тест расчета маршрута в пуле процессов, включенном через ROUTE_WORKERS"""
+    monkeypatch.setattr(main, "ROUTE_WORKERS", 1)
+    with TestClient(app) as client:
+        assert main.route_pool is not None
+        response = client.post("/api/route", json={"start": "entrance", "end": "build_2"})
+        assert response.status_code == 200
+        assert len(response.json()["route"]) > 1
+    assert main.route_pool is None
+
+
+def test_route_after_broken_pool(monkeypatch):
+    """Тест восстановления после аварийного завершения процесса пула"""
+    monkeypatch.setattr(main, "ROUTE_WORKERS", 1)
+    with TestClient(app) as client:
+        broken_pool = main.route_pool
+        # Принудительно завершаем рабочий процесс
+        broken_pool.submit(os._exit, 1)
+        
+        response = client.post("/api/route", json={"start": "entrance", "end": "build_2"})
+        assert response.status_code == 200
+        assert main.route_pool is not broken_pool
+        
+        response = client.post("/api/route", json={"start": "build_2", "end": "entrance"})
+        assert response.status_code == 200
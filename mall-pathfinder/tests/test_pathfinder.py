@@ -8,7 +8,8 @@ from typing import Dict, List, Any
 
 # Добавляем путь к директории app в sys.path для импорта модуля pathfinder
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from app.pathfinder import Graph, astar_algorithm
+from app import pathfinder
+from app.pathfinder import Graph, astar_algorithm, find_nearest_node, add_temporary_nodes
 
 
 # Фикстура для создания тестового графа
@@ -79,6 +80,14 @@ def test_get_neighbors(test_graph):
     assert test_graph.get_neighbors("Z") == []  # Несуществующий узел
 
 
+def test_has_edge(test_graph):
+    """Тест проверки наличия ребра"""
+    assert test_graph.has_edge("A", "B")
+    assert test_graph.has_edge("B", "A")
+    assert not test_graph.has_edge("A", "I")
+    assert not test_graph.has_edge("A", "Z")  # Несуществующий узел
+
+
 def test_heuristic(test_graph):
     """Тест эвристической функции"""
     # Расстояние между A(0,0) и I(2,2) должно быть sqrt(8) = 2.83
@@ -94,6 +103,44 @@ def test_distance(test_graph):
     assert test_graph.distance("A", "I") == test_graph.heuristic("A", "I")
 
 
+def test_find_nearest_node(test_graph):
+    """Тест поиска ближайшего узла"""
+    assert find_nearest_node(test_graph, 0, 0) == "A"
+    assert find_nearest_node(test_graph, 2, 1) == "F"
+    assert find_nearest_node(test_graph, 10, 10) == "I"
+
+
+def test_find_nearest_node_empty_graph():
+    """Тест поиска ближайшего узла в пустом графе"""
+    with pytest.raises(ValueError):
+        find_nearest_node(Graph(), 0, 0)
+
+
+def test_add_temporary_nodes(test_graph):
+    """Тест добавления временных узлов для произвольных точек"""
+    temp_graph, start_id, end_id = add_temporary_nodes(test_graph, (-1, 0), (3, 2))
+    
+    path = astar_algorithm(temp_graph, start_id, end_id)
+    assert path[:2] == [start_id, "A"]
+    assert path[-2:] == ["I", end_id]
+    assert len(path) == 7
+    
+    # Исходный граф не изменяется
+    assert start_id not in test_graph.nodes
+    assert test_graph.get_neighbors("A") == ["B", "D"]
+    assert test_graph.get_neighbors("I") == ["F", "H"]
+
+
+def test_add_temporary_nodes_same_nearest(test_graph):
+    """Тест временных узлов, ближайший узел которых совпадает"""
+    temp_graph, start_id, end_id = add_temporary_nodes(test_graph, (0, -1), (-1, 0))
+    
+    assert temp_graph.get_neighbors("A") == ["B", "D", start_id, end_id]
+    assert temp_graph.distance(start_id, "A") == 1.0
+    assert temp_graph.distance("A", end_id) == 1.0
+    assert astar_algorithm(temp_graph, start_id, end_id) == [start_id, "A", end_id]
+
+
 # Тесты для алгоритма A*
 def test_astar_same_node(test_graph):
     """Тест поиска пути, когда начальный и конечный узлы совпадают"""
@@ -123,6 +170,54 @@ def test_astar_complex_path(test_graph):
     assert path[-1] == "I"
 
 
+def test_astar_same_goal_repeated(test_graph):
+    """Тест повторных поисков пути к одной и той же цели"""
+    assert astar_algorithm(test_graph, "A", "C") == ["A", "B", "C"]
+    assert astar_algorithm(test_graph, "I", "C") == ["I", "F", "C"]
+    assert astar_algorithm(test_graph, "A", "C") == ["A", "B", "C"]
+
+
+def test_heuristic_cache_is_bounded(monkeypatch):
+    """Тест ограничения числа хранимых массивов эвристики"""
+    monkeypatch.setattr(pathfinder, "H_CACHE_SIZE", 2)
+    nodes = {str(i): {"x": i, "y": 0} for i in range(5)}
+    edges = {str(i): [str(j) for j in (i - 1, i + 1) if 0 <= j < 5] for i in range(5)}
+    graph = Graph(nodes, edges)
+    
+    for end in ("1", "2", "3", "4"):
+        assert astar_algorithm(graph, "0", end) == [str(i) for i in range(int(end) + 1)]
+    assert len(graph._h_caches) == 2
+    
+    # Повторный запрос к вытесненной цели по-прежнему дает верный путь
+    assert astar_algorithm(graph, "4", "1") == ["4", "3", "2", "1"]
+    assert len(graph._h_caches) == 2
+
+
+def test_astar_improved_open_node():
+    """Тест поиска пути, когда оценка узла в открытом списке улучшается"""
+    # Узел F сначала достигается через C, а затем более коротким путем через B
+    nodes = {
+        "A": {"x": 6, "y": 5},
+        "B": {"x": 3, "y": 3},
+        "C": {"x": 5, "y": 1},
+        "D": {"x": 6, "y": 3},
+        "E": {"x": 2, "y": 6},
+        "F": {"x": 1, "y": 4}
+    }
+    edges = {
+        "A": ["C", "D", "E"],
+        "B": ["C", "D", "E", "F"],
+        "C": ["A", "B", "D", "F"],
+        "D": ["A", "B", "C", "E"],
+        "E": ["A", "B", "D"],
+        "F": ["B", "C"]
+    }
+    graph = Graph(nodes, edges)
+    
+    path = astar_algorithm(graph, "A", "F")
+    assert path == ["A", "D", "B", "F"]
+
+
 def test_astar_nonexistent_node(test_graph):
     """Тест поиска пути с несуществующим узлом"""
     with pytest.raises(ValueError):